@@ -4,18 +4,21 @@ import pytest
 from matchpy.expressions.expressions import Operation, Symbol, Arity, Wildcard, make_dot_variable, make_star_variable, make_plus_variable
 import matchpy
 
+# Created once, so that the autouse fixture does not create a new operation class for every single test
+DEFAULT_EXPRESSIONS = {
+    'f': Operation.new('f', Arity.variadic),
+    'a': Symbol('a'),
+    'b': Symbol('b'),
+    'c': Symbol('c'),
+    'x_': make_dot_variable('x'),
+    'y_': make_dot_variable('y'),
+    '_': Wildcard.dot(),
+    '__': Wildcard.plus(),
+    '___': Wildcard.star(),
+    '__name__': '__main__',
+}
+DEFAULT_EXPRESSIONS.update((name, getattr(matchpy, name)) for name in matchpy.__all__)
+
 @pytest.fixture(autouse=True)
 def add_default_expressions(doctest_namespace):
-    doctest_namespace['f'] = Operation.new('f', Arity.variadic)
-    doctest_namespace['a'] = Symbol('a')
-    doctest_namespace['b'] = Symbol('b')
-    doctest_namespace['c'] = Symbol('c')
-    doctest_namespace['x_'] = make_dot_variable('x')
-    doctest_namespace['y_'] = make_dot_variable('y')
-    doctest_namespace['_'] = Wildcard.dot()
-    doctest_namespace['__'] = Wildcard.plus()
-    doctest_namespace['___'] = Wildcard.star()
-    doctest_namespace['__name__'] = '__main__'
-
-    for name in matchpy.__all__:
-        doctest_namespace[name] = getattr(matchpy, name)
+    doctest_namespace.update(DEFAULT_EXPRESSIONS)
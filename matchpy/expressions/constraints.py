@@ -25,14 +25,22 @@ False
 You can also create a subclass of the :class:`Constraint` class to create your own custom constraint type.
 """
 import inspect
+import weakref
 from collections import OrderedDict
-from typing import Callable, Optional, FrozenSet, Dict
+from functools import lru_cache
+from types import CodeType, FunctionType
+from typing import Callable, Optional, FrozenSet, Dict, Tuple
+
+from multiset import Multiset
 
 from . import substitution
 from ..utils import get_short_lambda_source, cached_property
 
 __all__ = ['Constraint', 'EqualVariablesConstraint', 'CustomConstraint']
 
+_VARIABLE_PARAMETER_KINDS = frozenset([inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY])
+_VARIABLE_ARGUMENT_FLAGS = inspect.CO_VARARGS | inspect.CO_VARKEYWORDS
+
 
 class Constraint(object):  # pylint: disable=too-few-public-methods
     """Base for pattern constraints.
@@ -93,10 +101,48 @@ class Constraint(object):  # pylint: disable=too-few-public-methods
         raise NotImplementedError
 
 
-class EqualVariablesConstraint(Constraint):  # pylint: disable=too-few-public-methods
+_interned_constraints = weakref.WeakValueDictionary()  # type: weakref.WeakValueDictionary
+
+
+class _InternedConstraintMeta(type):
+    """Metaclass for constraints whose instances are interned.
+
+    It overrides :meth:`__call__` to return the existing instance when a constraint is created again with the same
+    arguments, without initializing it again. The key for the arguments is computed by the ``_intern_key`` method of
+    the class. Subclasses that override ``__init__`` without also overriding ``_intern_key`` are not interned, because
+    they might have additional state.
+    """
+
+    def __init__(cls, name, bases, dct):
+        super(_InternedConstraintMeta, cls).__init__(name, bases, dct)
+
+        if '_intern_key' in dct:
+            cls._interned = True
+        elif '__init__' in dct:
+            cls._interned = False
+
+    def __call__(cls, *args, **kwargs):
+        if not cls._interned:
+            return super().__call__(*args, **kwargs)
+        create = lambda: super(_InternedConstraintMeta, cls).__call__(*args, **kwargs)
+        return cls._intern(cls._intern_key(*args, **kwargs), create)
+
+    def _intern(cls, key, create):
+        """Return the interned instance of the class for the key, using ``create()`` to create it if necessary."""
+        key = (cls, key)
+        instance = _interned_constraints.get(key, None)
+        if instance is None:
+            instance = create()
+            _interned_constraints[key] = instance
+        return instance
+
+
+class EqualVariablesConstraint(Constraint, metaclass=_InternedConstraintMeta):  # pylint: disable=too-few-public-methods
     """A constraint that ensure multiple variables are equal.
 
     The constraint tries to unify the substitutions for the variables and is fulfilled iff that succeeds.
+
+    Instances are interned, i.e. creating a constraint for the same variables again returns the existing instance.
     """
 
     def __init__(self, *variables: str) -> None:
@@ -105,37 +151,135 @@ class EqualVariablesConstraint(Constraint):  # pylint: disable=too-few-public-me
             *variables: The names of the variables to check for equality.
         """
         self._variables = frozenset(variables)
+        self._variables_tuple = tuple(self._variables)
+        self._hash = hash(self._variables)
+
+    @staticmethod
+    def _intern_key(*variables):
+        return frozenset(variables)
+
+    def __reduce__(self):
+        if not self._interned:
+            return super().__reduce__()
+        return type(self), self._variables_tuple
 
     @property
     def variables(self):
         return self._variables
 
     def __call__(self, match: substitution.Substitution) -> bool:
+        if not self._variables_tuple:
+            return True
+        pivot = match[self._variables_tuple[0]]
+        for name in self._variables_tuple[1:]:
+            value = match[name]
+            if value is pivot:
+                continue
+            if isinstance(value, Multiset) or isinstance(pivot, Multiset):
+                # Unordered replacements need to be unified with ordered ones
+                return self._unify(match)
+            if value != pivot:
+                return False
+        return True
+
+    def _unify(self, match: substitution.Substitution) -> bool:
         subst = substitution.Substitution()
-        for name in self._variables:
+        for name in self._variables_tuple:
             try:
                 subst.try_add_variable('_', match[name])
             except ValueError:
                 return False
         return True
 
+    @cached_property
+    def _description(self):
+        return ' == '.join(sorted(self._variables))
+
     def __str__(self):
-        return '({!s})'.format(' == '.join(sorted(self._variables)))
+        return '({!s})'.format(self._description)
 
     def __repr__(self):
-        return 'EqualVariablesConstraint({!s})'.format(' == '.join(sorted(self._variables)))
+        return 'EqualVariablesConstraint({!s})'.format(self._description)
 
     def __eq__(self, other):
         return isinstance(other, EqualVariablesConstraint) and self._variables == other._variables
 
     def __hash__(self):
-        return hash(self._variables)
+        return self._hash
 
     def with_renamed_vars(self, renaming):
         return EqualVariablesConstraint(*(renaming.get(v, v) for v in self.variables))
 
 
-class CustomConstraint(Constraint):  # pylint: disable=too-few-public-methods
+@lru_cache(maxsize=None)
+def _code_parameters(code: CodeType) -> Optional[Tuple[str, ...]]:
+    """Return the parameter names of a plain function from its code object.
+
+    The result is cached per code object rather than per function, so that it does not keep the functions (and their
+    closures and defaults) alive, and functions created from the same definition share the entry.
+
+    Returns:
+        The parameter names or None, if the function has positional-only or variable parameters.
+    """
+    if code.co_flags & _VARIABLE_ARGUMENT_FLAGS or getattr(code, 'co_posonlyargcount', 0):
+        return None
+    return code.co_varnames[:code.co_argcount + code.co_kwonlyargcount]
+
+
+def _analyze_callable(constraint: Callable[..., bool]) -> Tuple[str, ...]:
+    r"""Return the parameter names of the constraint callback.
+
+    Raises:
+        ValueError:
+            If the callback has positional-only or variable parameters (\*args and \*\*kwargs).
+    """
+    if isinstance(constraint, FunctionType) and not hasattr(constraint, '__wrapped__') and \
+            not hasattr(constraint, '__signature__'):
+        names = _code_parameters(constraint.__code__)
+        if names is not None:
+            return names
+
+    names = []
+    for param in inspect.signature(constraint).parameters.values():
+        if param.kind in _VARIABLE_PARAMETER_KINDS:
+            names.append(param.name)
+        elif param.kind == inspect.Parameter.VAR_KEYWORD:
+            raise ValueError("Constraint cannot have variable keyword arguments ({})".format(param.name))
+        else:
+            raise ValueError(
+                "Constraint cannot have positional-only or variable positional arguments ({})".format(param.name)
+            )
+    return tuple(names)
+
+
+@lru_cache(maxsize=None)
+def _make_argument_getter(variables: Tuple[Tuple[str, str], ...]
+                         ) -> Callable[[substitution.Substitution], Tuple[dict, tuple, tuple]]:
+    """Generate a function that extracts the callback keyword arguments from a match substitution.
+
+    The generated function looks up every variable once and builds its results with literal displays instead of loops.
+
+    Args:
+        variables:
+            Pairs of parameter name and variable name.
+
+    Returns:
+        A function that maps a substitution to a :class:`dict` of keyword arguments, a tuple of the argument values and
+        a cache key containing the identities of those values.
+    """
+    lines = ['def get_arguments(match):']
+    for i, (_, var_name) in enumerate(variables):
+        lines.append('    v{} = match[{!r}]'.format(i, var_name))
+    arguments = ', '.join('{!r}: v{}'.format(param_name, i) for i, (param_name, _) in enumerate(variables))
+    values = ''.join('v{}, '.format(i) for i in range(len(variables)))
+    key = ''.join('id(v{}), '.format(i) for i in range(len(variables)))
+    lines.append('    return {{{}}}, ({}), ({})'.format(arguments, values, key))
+    namespace = {}  # type: Dict[str, Callable]
+    exec('\n'.join(lines), namespace)  # pylint: disable=exec-used
+    return namespace['get_arguments']
+
+
+class CustomConstraint(Constraint, metaclass=_InternedConstraintMeta):  # pylint: disable=too-few-public-methods
     """Wrapper for lambdas of functions as constraints.
 
     The parameter names have to be the same as the the variable names in the expression:
@@ -153,10 +297,16 @@ class CustomConstraint(Constraint):  # pylint: disable=too-few-public-methods
     Note, that the matching happens from left left to right, so not all variables may have been assigned a value when
     constraint is called. For constraints over multiple variables you should attach the constraint to the last
     variable occurring in the pattern or a surrounding operation.
+
+    The callback is expected to be pure. Its results are cached for the most recently used argument values, as the
+    same subexpressions are often checked repeatedly while backtracking. The cache compares the values by identity.
+    Instances are interned, so that constraints with the same callback and variables share their cache.
     """
 
+    CACHE_SIZE = 256
+
     def __init__(self, constraint: Callable[..., bool]) -> None:
-        """
+        r"""
         Args:
             constraint:
                 The constraint callback.
@@ -165,41 +315,66 @@ class CustomConstraint(Constraint):  # pylint: disable=too-few-public-methods
             ValueError:
                 If the callback has positional-only or variable parameters (\*args and \*\*kwargs).
         """
+        self._initialize(constraint, tuple((name, name) for name in _analyze_callable(constraint)))
+
+    @staticmethod
+    def _intern_key(constraint):
+        return constraint, None
+
+    def _initialize(self, constraint: Callable[..., bool], variables: Tuple[Tuple[str, str], ...]) -> None:
         self.constraint = constraint
-        signature = inspect.signature(constraint)
+        self._variables = OrderedDict(variables)
+        self._get_arguments = _make_argument_getter(variables)
+        self._cache = OrderedDict()
 
-        self._variables = OrderedDict()
+    @classmethod
+    def _create(cls, constraint: Callable[..., bool], variables: Tuple[Tuple[str, str], ...]) -> 'CustomConstraint':
+        """Return the interned constraint for the callback with the given mapping from parameters to variables."""
 
-        for param in signature.parameters.values():
-            if param.kind == inspect.Parameter.POSITIONAL_OR_KEYWORD or param.kind == inspect.Parameter.KEYWORD_ONLY:
-                self._variables[param.name] = param.name
-            elif param.kind == inspect.Parameter.VAR_KEYWORD:
-                raise ValueError("Constraint cannot have variable keyword arguments ({})".format(param.name))
-            else:
-                raise ValueError(
-                    "Constraint cannot have positional-only or variable positional arguments ({})".format(param.name)
-                )
+        def create():
+            instance = cls.__new__(cls)
+            instance._initialize(constraint, variables)
+            return instance
+
+        if all(param_name == var_name for param_name, var_name in variables):
+            return cls._intern(cls._intern_key(constraint), create)
+        return cls._intern((constraint, variables), create)
+
+    def __reduce__(self):
+        if not self._interned:
+            return super().__reduce__()
+        return type(self)._create, (self.constraint, tuple(self._variables.items()))
 
     @property
     def variables(self):
         return frozenset(self._variables.values())
 
     def __call__(self, match: substitution.Substitution) -> bool:
-        args = dict((name, match[var_name]) for name, var_name in self._variables.items())
-
-        return self.constraint(**args)
-
-    def _get_name(self):
+        args, values, key = self._get_arguments(match)
+        entry = self._cache.get(key, None)
+        if entry is not None:
+            self._cache.move_to_end(key)
+            return entry[1]
+
+        result = self.constraint(**args)
+        # The values are kept in the entry, so that their ids cannot be reused while it is cached
+        self._cache[key] = (values, result)
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return result
+
+    @cached_property
+    def _name(self):
         try:
             return get_short_lambda_source(self.constraint) or self.constraint.__name__
         except Exception:
             return 'UNKNOWN'
 
     def __str__(self):
-        return '({!s})'.format(self._get_name())
+        return '({!s})'.format(self._name)
 
     def __repr__(self):
-        return 'CustomConstraint({!s})'.format(self._get_name())
+        return 'CustomConstraint({!s})'.format(self._name)
 
     def __eq__(self, other):
         return (
@@ -211,8 +386,6 @@ class CustomConstraint(Constraint):  # pylint: disable=too-few-public-methods
         return hash(self.constraint)
 
     def with_renamed_vars(self, renaming):
-        cc = CustomConstraint(self.constraint)
-        for param_name in cc._variables.keys():
-            old_name = self._variables[param_name]
-            cc._variables[param_name] = renaming.get(old_name, old_name)
-        return cc
+        variables = tuple((param, renaming.get(var_name, var_name)) for param, var_name in self._variables.items())
+        cls = type(self) if self._interned else CustomConstraint
+        return cls._create(self.constraint, variables)
@@ -127,13 +127,8 @@ class _MatchIter:
         for pattern_index in self.patterns:
             renaming = self.matcher.pattern_vars[pattern_index]
             new_substitution = self.substitution.rename({renamed: original for original, renamed in renaming.items()})
-            pattern, label, _ = self.matcher.patterns[pattern_index]
-            valid = True
-            for constraint in pattern.global_constraints:
-                if not constraint(new_substitution):
-                    valid = False
-                    break
-            if valid:
+            label = self.matcher.patterns[pattern_index][1]
+            if all(c(new_substitution) for c in self.matcher.global_constraints[pattern_index]):
                 yield label, new_substitution
 
     def _match(self, state: _State) -> Iterator[_State]:
@@ -321,7 +316,10 @@ class _MatchIter:
 
 
 class ManyToOneMatcher:
-    __slots__ = ('patterns', 'states', 'root', 'pattern_vars', 'constraints', 'constraint_vars', 'finals', 'rename', 'commutative_matchers')
+    __slots__ = (
+        'patterns', 'states', 'root', 'pattern_vars', 'global_constraints', 'constraints', 'constraint_indices',
+        'constraint_vars', 'finals', 'rename', 'commutative_matchers'
+    )
 
     _state_id = 0
 
@@ -334,7 +332,9 @@ class ManyToOneMatcher:
         self.states = []
         self.root = self._create_state()
         self.pattern_vars = []
+        self.global_constraints = []
         self.constraints = []
+        self.constraint_indices = {}
         self.constraint_vars = {}
         self.finals = set()
         self.rename = rename
@@ -390,6 +390,7 @@ class ManyToOneMatcher:
         constraint_indices = [self._add_constraint(c, pattern_index) for c in renamed_constraints]
         self.patterns.append((pattern, label, constraint_indices))
         self.pattern_vars.append(renaming)
+        self.global_constraints.append(tuple(pattern.global_constraints))
         pattern = rename_variables(pattern.expression, renaming)
         state = self.root
         patterns_stack = [deque([pattern])]
@@ -425,15 +426,13 @@ class ManyToOneMatcher:
 
 
     def _add_constraint(self, constraint, pattern):
-        index = None
-        for i, (c, patterns) in enumerate(self.constraints):
-            if c == constraint:
-                patterns.add(pattern)
-                index = i
-                break
+        index = self.constraint_indices.get(constraint, None)
+        if index is not None:
+            self.constraints[index][1].add(pattern)
         else:
             index = len(self.constraints)
             self.constraints.append((constraint, set([pattern])))
+            self.constraint_indices[constraint] = index
         for var in constraint.variables:
             self.constraint_vars.setdefault(var, set()).add(index)
         return index
@@ -363,9 +363,10 @@ def _fixed_var_iter_factory(variable_name, count, length, symbol_type, constrain
     def factory(data):
         subjects, substitution = data
         if variable_name in substitution:
-            value = ([substitution[variable_name]]
-                     if not isinstance(substitution[variable_name], (tuple, list, Multiset)) else substitution[variable_name])
-            if optional is not None and value == [optional]:
+            value = substitution[variable_name]
+            if not isinstance(value, (tuple, list, Multiset)):
+                value = (value, )
+            if optional is not None and value == (optional, ):
                 yield subjects, substitution
             existing = Multiset(value) * count
             if not existing <= subjects:
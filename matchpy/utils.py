@@ -66,13 +66,35 @@ def fixed_integer_vector_iter(max_vector: Tuple[int, ...], vector_sum: int) -> I
         if vector_sum == 0:
             yield tuple()
         return
-    total = sum(max_vector)
-    if vector_sum <= total:
-        start = max(max_vector[0] + vector_sum - total, 0)
-        end = min(max_vector[0], vector_sum)
-        for j in range(start, end + 1):
-            for vec in fixed_integer_vector_iter(max_vector[1:], vector_sum - j):
-                yield (j, ) + vec
+    if vector_sum > sum(max_vector):
+        return
+    last = len(max_vector) - 1
+    # rest[i] is the largest sum that the components after i can have
+    rest = [0] * (last + 1)
+    for i in range(last - 1, -1, -1):
+        rest[i] = rest[i + 1] + max_vector[i + 1]
+    vector = [0] * (last + 1)
+    # remainders[i] is the sum that is left for the components starting at i
+    remainders = [0] * (last + 1)
+    start = 0
+    remainder = vector_sum
+    while True:
+        # Fill up the components from start with the smallest possible values
+        for i in range(start, last + 1):
+            remainders[i] = remainder
+            value = remainder - rest[i] if remainder > rest[i] else 0
+            vector[i] = value
+            remainder -= value
+        yield tuple(vector)
+        # Increment the rightmost component that can still grow (the last one is determined by the others)
+        start = last - 1
+        while start >= 0 and (vector[start] >= max_vector[start] or vector[start] >= remainders[start]):
+            start -= 1
+        if start < 0:
+            return
+        vector[start] += 1
+        remainder = remainders[start] - vector[start]
+        start += 1
 
 
 def weak_composition_iter(n: int, num_parts: int) -> Iterator[Tuple[int, ...]]:
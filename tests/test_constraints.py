@@ -1,9 +1,16 @@
 # -*- coding: utf-8 -*-
+import copy
+import functools
+import gc
+import weakref
 from unittest.mock import Mock
 
 import pytest
+from multiset import Multiset
 
 from matchpy.expressions.constraints import Constraint, CustomConstraint, EqualVariablesConstraint
+from matchpy.expressions.functions import preorder_iter
+from .common import SpecialSymbol, a, b, f
 
 
 class DummyConstraint(Constraint):
@@ -40,6 +47,16 @@ CUSTOM_CONSTRAINTS = [C_custom1, C_custom2, C_custom3]
     [
         (['x', 'y'],    {'x': 0, 'y': 0},       True),
         (['x', 'y'],    {'x': 0, 'y': 1},       False),
+        (['x'],         {'x': 0},               True),
+        ([],            {},                     True),
+        (['x', 'y'],    {'x': (0, 1), 'y': (0, 1)},                     True),
+        (['x', 'y'],    {'x': (0, 1), 'y': (1, 0)},                     False),
+        (['x', 'y'],    {'x': (0, 1), 'y': 0},                          False),
+        (['x', 'y'],    {'x': (0, 1), 'y': Multiset([1, 0])},           True),
+        (['x', 'y'],    {'x': Multiset([0, 1]), 'y': (1, 0)},           True),
+        (['x', 'y'],    {'x': Multiset([0, 1]), 'y': Multiset([1, 0])}, True),
+        (['x', 'y'],    {'x': Multiset([0, 1]), 'y': Multiset([0])},    False),
+        (['x', 'y'],    {'x': Multiset([0]), 'y': 0},                   False),
     ]
 )  # yapf: disable
 def test_equal_variables_constraint_call(variables, substitution, expected_result):
@@ -109,6 +126,11 @@ def test_equal_variables_constraint_vars():
     assert c1.variables == {'x', 'y'}
 
 
+def test_equal_variables_constraint_dedup():
+    constraints = {EqualVariablesConstraint('x', 'y'), EqualVariablesConstraint('y', 'x'), EqualVariablesConstraint('x')}
+    assert len(constraints) == 2
+
+
 def test_equal_variables_constraint_with_renamed_vars():
     c1 = EqualVariablesConstraint('x', 'y')
     c2 = c1.with_renamed_vars({'x': 'z'})
@@ -122,6 +144,28 @@ def test_custom_constraint_vars():
     assert c1.variables == {'x', 'y'}
 
 
+def test_custom_constraint_keyword_only_vars():
+    def constraint(x, *, y):
+        return x == y
+
+    c1 = CustomConstraint(constraint)
+    assert c1.variables == {'x', 'y'}
+    assert c1({'x': 1, 'y': 1}) is True
+
+
+def test_custom_constraint_wrapped_vars():
+    def constraint(x, y):
+        return x == y
+
+    @functools.wraps(constraint)
+    def wrapper(*args, **kwargs):
+        return constraint(*args, **kwargs)
+
+    c1 = CustomConstraint(wrapper)
+    assert c1.variables == {'x', 'y'}
+    assert c1({'x': 1, 'y': 2}) is False
+
+
 def test_custom_constraint_with_renamed_vars():
     actual_x = None
     actual_y = None
@@ -154,3 +198,149 @@ def test_custom_constraint_repeated_renaming():
     assert c3.variables == {'x3', 'y'}
     c4 = c3.with_renamed_vars({'z1': 'z2'})
     assert c4.variables == {'x3', 'y'}
+
+
+def test_custom_constraint_shared_callback():
+    def constraint(x, y):
+        return x == y
+
+    c1 = CustomConstraint(constraint)
+    c2 = CustomConstraint(constraint)
+    assert c1.variables == c2.variables == {'x', 'y'}
+    c3 = c1.with_renamed_vars({'x': 'z'})
+    assert c3.variables == {'z', 'y'}
+    assert CustomConstraint(constraint).variables == {'x', 'y'}
+
+
+def test_custom_constraint_releases_callback():
+    def make_callback(big):
+        return lambda x: x == big
+
+    callback = make_callback(object())
+    callback_ref = weakref.ref(callback)
+    c1 = CustomConstraint(callback)
+    assert c1({'x': 1}) is False
+    del c1, callback
+    gc.collect()
+    assert callback_ref() is None
+
+
+def test_custom_constraint_call_cached():
+    callback = Mock(return_value=True)
+    c1 = CustomConstraint(lambda x: callback(x))
+
+    assert c1({'x': 1})
+    assert c1({'x': 1, 'y': 2})
+    assert callback.call_count == 1
+    assert c1({'x': 2})
+    assert callback.call_count == 2
+
+
+class SmallCacheConstraint(CustomConstraint):
+    CACHE_SIZE = 2
+
+
+def test_custom_constraint_call_cache_eviction():
+    callback = Mock(return_value=True)
+    c1 = SmallCacheConstraint(lambda x: callback(x))
+    v1, v2, v3 = f(a), f(a), f(a)
+
+    for value in [v1, v2, v1, v3, v1]:
+        assert c1({'x': value})
+    assert callback.call_count == 3
+    assert c1({'x': v2})
+    assert callback.call_count == 4
+
+
+@pytest.mark.parametrize(
+    '   value,                  special_value',
+    [
+        (a,                     SpecialSymbol('a')),
+        ((a, ),                 (SpecialSymbol('a'), )),
+        ((b, a),                (b, SpecialSymbol('a'))),
+        (f(a),                  f(SpecialSymbol('a'))),
+        ((f(b, a), ),           (f(b, SpecialSymbol('a')), )),
+    ]
+)  # yapf: disable
+def test_custom_constraint_call_cached_subclass_values(value, special_value):
+    c1 = CustomConstraint(lambda x: any(isinstance(e, SpecialSymbol) for e in preorder_iter(x)))
+
+    assert value == special_value
+    assert not c1({'x': value})
+    assert c1({'x': special_value})
+
+
+def test_custom_constraint_call_unhashable():
+    c1 = CustomConstraint(lambda x: len(x) == 2)
+
+    assert c1({'x': Multiset([1, 2])})
+    assert not c1({'x': Multiset([1])})
+
+
+def test_constraint_interning():
+    def constraint(x, y):
+        return x == y
+
+    assert EqualVariablesConstraint('x', 'y') is EqualVariablesConstraint('y', 'x')
+    assert EqualVariablesConstraint('x', 'y').with_renamed_vars({'x': 'z'}) is EqualVariablesConstraint('z', 'y')
+    assert CustomConstraint(constraint) is CustomConstraint(constraint)
+    assert CustomConstraint(constraint).with_renamed_vars({'x': 'z'}) is not CustomConstraint(constraint)
+    assert CustomConstraint(constraint).with_renamed_vars({'x': 'z'}) is \
+        CustomConstraint(constraint).with_renamed_vars({'x': 'z'})
+    assert CustomConstraint(constraint).with_renamed_vars({'z': 'x'}) is CustomConstraint(constraint)
+    assert copy.deepcopy(CustomConstraint(constraint)) is CustomConstraint(constraint)
+    assert copy.deepcopy(EqualVariablesConstraint('x', 'y')) is EqualVariablesConstraint('x', 'y')
+
+
+class LabeledEqualVariablesConstraint(EqualVariablesConstraint):
+    def __init__(self, label, *variables):
+        super().__init__(*variables)
+        self.label = label
+
+
+class LabeledCustomConstraint(CustomConstraint):
+    def __init__(self, label, constraint):
+        super().__init__(constraint)
+        self.label = label
+
+
+class KeyedCustomConstraint(CustomConstraint):
+    def __init__(self, label, constraint):
+        super().__init__(constraint)
+        self.label = label
+
+    @staticmethod
+    def _intern_key(label, constraint):
+        return label, constraint
+
+
+def test_constraint_subclass_with_init():
+    def constraint(x, y):
+        return x == y
+
+    c1 = LabeledEqualVariablesConstraint('l1', 'x', 'y')
+    c2 = LabeledEqualVariablesConstraint('l2', 'x', 'y')
+    assert (c1.label, c2.label) == ('l1', 'l2')
+    assert c1.variables == {'x', 'y'}
+    assert c1({'x': 1, 'y': 1}) is True
+    assert copy.copy(c1).label == 'l1'
+
+    c3 = LabeledCustomConstraint('l3', constraint)
+    c4 = LabeledCustomConstraint('l4', constraint)
+    assert (c3.label, c4.label) == ('l3', 'l4')
+    assert c3.variables == {'x', 'y'}
+    assert c3({'x': 1, 'y': 2}) is False
+    assert copy.copy(c3).label == 'l3'
+    assert c3.with_renamed_vars({'x': 'z'}).variables == {'z', 'y'}
+    assert copy.copy(c3) is not c3
+
+
+def test_constraint_subclass_with_intern_key():
+    def constraint(x, y):
+        return x == y
+
+    c1 = KeyedCustomConstraint('l1', constraint)
+    assert c1 is KeyedCustomConstraint('l1', constraint)
+    assert c1 is not KeyedCustomConstraint('l2', constraint)
+    assert c1.label == 'l1'
+    assert c1({'x': 1, 'y': 1}) is True
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import inspect
 import itertools
+from functools import lru_cache
 
 import pytest
 from multiset import Multiset
@@ -355,12 +356,15 @@ class TestOperation:
             Operation.new('Invalid', Arity.unary, infix=True)
 
 
+@lru_cache(maxsize=None)
+def _operand_field_names(cls):
+    return tuple(field.name for field in fields(cls) if not field.metadata.get("not_an_operand", False))
+
+
 class AbstractDataclassOp(Operation):
     @property
     def operands(self):
-        return tuple(getattr(self, field.name)
-                     for field in fields(self)
-                     if not field.metadata.get("not_an_operand", False))
+        return tuple(getattr(self, name) for name in _operand_field_names(type(self)))
 
 
 @dataclass
@@ -111,15 +111,18 @@ class TestReplaceTest:
         assert result is not expression, "Replacement modified the original expression"
 
     @pytest.mark.parametrize('replace', [replace, many_replace_wrapper])
-    def test_too_big_position_error(self, replace):
-        with pytest.raises(IndexError):
-            replace(a, (0, ), b)
-        with pytest.raises(IndexError):
-            replace(f(a), (0, 0), b)
-        with pytest.raises(IndexError):
-            replace(f(a), (1, ), b)
+    @pytest.mark.parametrize(
+        '   expression,     position',
+        [
+            (a,             (0, )),
+            (f(a),          (0, 0)),
+            (f(a),          (1, )),
+            (f(a, b),       (2, )),
+        ]
+    )  # yapf: disable
+    def test_too_big_position_error(self, replace, expression, position):
         with pytest.raises(IndexError):
-            replace(f(a, b), (2, ), b)
+            replace(expression, position, b)
 
 
 class TestReplaceManyTest:
@@ -144,13 +147,17 @@ class TestReplaceManyTest:
         )
         assert result is not expression, "Replacement modified the original expression"
 
-    def test_inconsistent_position_error(self):
-        with pytest.raises(IndexError):
-            replace_many(f(a), [((), b), ((0, ), b)])
-        with pytest.raises(IndexError):
-            replace_many(a, [((), b), ((0, ), b)])
+    @pytest.mark.parametrize(
+        '   expression,     replacements',
+        [
+            (f(a),          [((), b), ((0, ), b)]),
+            (a,             [((), b), ((0, ), b)]),
+            (a,             [((0, ), b), ((1, ), b)]),
+        ]
+    )  # yapf: disable
+    def test_inconsistent_position_error(self, expression, replacements):
         with pytest.raises(IndexError):
-            replace_many(a, [((0, ), b), ((1, ), b)])
+            replace_many(expression, replacements)
 
     def test_empty_replace(self):
         expression = f(a, b)
@@ -49,15 +49,14 @@ class TestMatch:
     def test_constant_match(self, match_syntactic, expression, pattern, is_match):
         expression = expression
         pattern = Pattern(pattern)
-        result = list(match_syntactic(expression, pattern))
+        matches = iter(match_syntactic(expression, pattern))
         if is_match:
-            assert result == [dict()], "Expression {!s} and {!s} did not match but were supposed to".format(
-                expression, pattern
-            )
-        else:
-            assert result == [], "Expression {!s} and {!s} did match but were not supposed to".format(
+            assert next(matches, None) == dict(), "Expression {!s} and {!s} did not match but were supposed to".format(
                 expression, pattern
             )
+        assert next(matches, None) is None, "Expression {!s} and {!s} did match but were not supposed to".format(
+            expression, pattern
+        )
 
     @pytest.mark.parametrize(
         '   expression,         pattern,            is_match',
@@ -87,15 +86,14 @@ class TestMatch:
     def test_commutative_match(self, match, expression, pattern, is_match):
         expression = expression
         pattern = Pattern(pattern)
-        result = list(match(expression, pattern))
+        matches = iter(match(expression, pattern))
         if is_match:
-            assert result == [dict()], "Expression {!s} and {!s} did not match but were supposed to".format(
-                expression, pattern
-            )
-        else:
-            assert result == [], "Expression {!s} and {!s} did match but were not supposed to".format(
+            assert next(matches, None) == dict(), "Expression {!s} and {!s} did not match but were supposed to".format(
                 expression, pattern
             )
+        assert next(matches, None) is None, "Expression {!s} and {!s} did match but were not supposed to".format(
+            expression, pattern
+        )
 
     @pytest.mark.parametrize(
         '   expression,         pattern,                    match_count',
@@ -29,6 +29,14 @@ def test_add_duplicate_pattern_with_different_constraint():
     assert len(matcher.patterns) == 2
 
 
+def test_add_shared_constraint():
+    constraint = CustomConstraint(lambda x: len(str(x)) > 1)
+    matcher = ManyToOneMatcher(Pattern(f(x_), constraint), Pattern(f(x_, b), constraint), rename=False)
+
+    assert len(matcher.constraints) == 1
+    assert matcher.constraints[0][1] == {0, 1}
+
+
 def test_different_constraints():
     c1 = CustomConstraint(lambda x: len(str(x)) > 1)
     c2 = CustomConstraint(lambda x: len(str(x)) == 1)